@@ -3,76 +3,101 @@
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import os
 
 print("=" * 60)
 print("气象演示数据生成器")
 print("=" * 60)
 
-# 生成1000行数据
+# 生成1000行数据，另预留3行用于插入重复数据（预分配，避免事后concat整表复制）
 n_rows = 1000
-timestamps = [datetime(2025, 1, 1, 0, 0) + timedelta(hours=i) for i in range(n_rows)]
+duplicate_rows = [100, 200, 300]
+n_total = n_rows + len(duplicate_rows)
+
+timestamps = np.empty(n_total, dtype='datetime64[ns]')
+timestamps[:n_rows] = pd.date_range('2025-01-01', periods=n_rows, freq='h').to_numpy()
 
 print(f"生成 {n_rows} 行演示数据...")
 
-# 创建基础数据（合理范围）
-np.random.seed(42)  # 固定随机种子，确保可重复
-df = pd.DataFrame({
-    'timestamp': timestamps,
-    'temperature': 15 + np.random.randn(n_rows) * 5,    # 平均15°C
-    'humidity': 65 + np.random.randn(n_rows) * 15,      # 平均65%
-    'pressure': 1013 + np.random.randn(n_rows) * 10,    # 平均1013hPa
-    'wind_speed': 3 + np.random.exponential(2, n_rows)  # 平均3m/s
-})
+# 创建基础数据（合理范围），数值列放在一个连续的ndarray中
+# 气象数值范围用float32足够，内存和读取带宽减半
+# 所有随机数来自同一个Generator：正态分布的三列一次二维抽样
+rng = np.random.default_rng(42)  # 固定随机种子，确保可重复
+numeric_cols = ['temperature', 'humidity', 'pressure', 'wind_speed']
+values = np.empty((n_total, len(numeric_cols)), dtype=np.float32)
+# 温度平均15°C、湿度平均65%、气压平均1013hPa
+values[:n_rows, :3] = rng.standard_normal((n_rows, 3)) * [5, 15, 10] + [15, 65, 1013]
+values[:n_rows, 3] = rng.standard_exponential(n_rows) * 2 + 3  # 风速：3m/s基础上叠加指数分布
 
 print("✅ 基础数据生成完成")
 
 # === 插入数据质量问题 ===
 
-# 1. 缺失值（约8%）
-missing_mask = np.random.rand(n_rows) < 0.08
-df.loc[missing_mask, 'temperature'] = np.nan
-df.loc[np.random.rand(n_rows) < 0.05, 'humidity'] = np.nan
-df.loc[np.random.rand(n_rows) < 0.03, 'pressure'] = np.nan
-
-print(f"✅ 插入缺失值: {df.isna().sum().sum()} 个")
-
-# 2. 明显异常值
-df.loc[50, 'temperature'] = 999.0    # 异常高温
-df.loc[150, 'temperature'] = -50.0   # 异常低温  
-df.loc[250, 'humidity'] = 150.0      # 超100%湿度
-df.loc[350, 'humidity'] = -10.0      # 负湿度
-df.loc[450, 'pressure'] = 2000.0     # 异常高压
-df.loc[550, 'wind_speed'] = 999.0    # 异常风速
+# 1. 缺失值（温度约8%、湿度约5%、气压约3%），一次生成三列的缺失掩码
+missing_mask = rng.random((n_rows, 3)) < [0.08, 0.05, 0.03]
+values[:n_rows, :3][missing_mask] = np.nan
+
+print(f"✅ 插入缺失值: {int(missing_mask.sum())} 个")
+
+# 2. 明显异常值（一次花式索引赋值写入全部6个）
+outlier_rows = np.array([50, 150, 250, 350, 450, 550])
+outlier_cols = np.array([0, 0, 1, 1, 2, 3])  # 对应 numeric_cols 的下标
+outlier_vals = np.array([
+    999.0,   # 异常高温
+    -50.0,   # 异常低温
+    150.0,   # 超100%湿度
+    -10.0,   # 负湿度
+    2000.0,  # 异常高压
+    999.0,   # 异常风速
+])
+values[outlier_rows, outlier_cols] = outlier_vals
 
 print("✅ 插入6个明显异常值")
 
-# 3. 重复行（3组重复）
-df = pd.concat([df, df.iloc[[100, 200, 300]]], ignore_index=True)
+# 3. 重复行（3组重复），直接写入预留的末尾3行
+values[n_rows:] = values[duplicate_rows]
+timestamps[n_rows:] = timestamps[duplicate_rows]
 
 print("✅ 插入3组重复数据")
 
 # 4. 时间戳错乱（1处）
-df.loc[600, 'timestamp'] = df.loc[600, 'timestamp'] - timedelta(days=365)
+timestamps[600] -= np.timedelta64(365, 'D')
 
 print("✅ 插入1处时间戳错乱")
 
+# 所有数据准备完毕后一次性构建DataFrame
+df = pd.DataFrame(values, columns=numeric_cols)
+df.insert(0, 'timestamp', timestamps)
+
 # 保存文件
 output_path = "demo_data.csv"
-df.to_csv(output_path, index=False)
+# 4MB写缓冲减少write系统调用；固定'\n'换行，跳过平台换行符转换
+with open(output_path, 'wb', buffering=4 * 1024 * 1024) as f:
+    df.to_csv(f, index=False, lineterminator='\n')
+
+# 同时输出Parquet：列式带类型存储，加载时无需逐行解析文本
+parquet_path = "demo_data.parquet"
+try:
+    df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
+except ImportError:
+    parquet_path = None
+    print("⚠️  未安装pyarrow，跳过Parquet文件输出")
 
 print("=" * 60)
 print("🎉 演示数据生成完成！")
 print("=" * 60)
 print(f"文件位置: {os.path.abspath(output_path)}")
+if parquet_path:
+    print(f"Parquet文件: {os.path.abspath(parquet_path)}")
 print(f"数据形状: {df.shape}")
 print(f"总行数: {len(df)}")
 print(f"总列数: {len(df.columns)}")
 print("\n📊 数据质量概况:")
-print(f"  缺失值总数: {df.isna().sum().sum()}")
-print(f"  温度缺失: {df['temperature'].isna().sum()}")
-print(f"  湿度缺失: {df['humidity'].isna().sum()}")
+# 直接在数值矩阵上统计缺失，一次求出各列计数（时间戳列不含缺失）
+missing_counts = np.isnan(values).sum(axis=0)
+print(f"  缺失值总数: {int(missing_counts.sum())}")
+print(f"  温度缺失: {missing_counts[numeric_cols.index('temperature')]}")
+print(f"  湿度缺失: {missing_counts[numeric_cols.index('humidity')]}")
 print(f"  数据列: {', '.join(df.columns)}")
 print("=" * 60)
 print("💡 此文件专为校赛答辩设计，包含多种真实数据问题")
@@ -1,14 +1,56 @@
 # src/data/imputation.py
 
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Dict, Any
 import warnings
 
+from numeric_utils数值工具 import as_float_array
+
+
+def _nan_runs(mask: np.ndarray):
+    """
+    由缺失掩码找出所有连续缺失段落
+
+    Returns:
+        (starts, ends): 各段落的起止位置，左闭右开
+    """
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.view(np.int8), 0]))
+    return edges[::2], edges[1::2]
+
+
+def _runs_to_mask(size: int, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """把若干互不重叠的段落 [start, end) 还原为布尔掩码（差分+累加，无Python循环）"""
+    delta = np.zeros(size + 1, dtype=np.int8)
+    delta[starts] = 1
+    delta[ends] = -1
+    return np.cumsum(delta[:-1]) > 0
+
+
+def _prepare_frame(df: pd.DataFrame, column: str, inplace: bool) -> pd.DataFrame:
+    """
+    准备写入结果的DataFrame
+
+    inplace=True 直接返回原DataFrame；否则浅复制整表，只深复制将被修改的列，
+    其余列与原DataFrame共享数据，避免整表复制带来的内存峰值
+    """
+    if column not in df.columns:
+        raise ValueError(f"列 '{column}' 不在DataFrame中")
+    if inplace:
+        return df
+    df_imputed = df.copy(deep=False)
+    df_imputed[column] = df[column].copy()
+    return df_imputed
+
+
 def linear_impute(df: pd.DataFrame, 
                   column: str = 'temperature',
                   max_gap: Optional[int] = 5,
-                  method: str = 'linear') -> pd.DataFrame:
+                  method: str = 'linear',
+                  inplace: bool = False,
+                  dtype=None) -> pd.DataFrame:
     """
     对指定列进行线性插值处理连续缺失值
     
@@ -18,14 +60,15 @@ def linear_impute(df: pd.DataFrame,
         max_gap: 最大连续缺失值数量，超过此数量的连续缺失不进行插值
                  None表示无限制
         method: 插值方法 ('linear', 'time', 'pad', 'nearest')
+        inplace: 是否直接修改传入的DataFrame
+        dtype: 插值前将该列转换为的类型，如np.float32可减半内存带宽；None表示保持原类型
     
     Returns:
         插值后的DataFrame
     """
-    df_imputed = df.copy()
-    
-    if column not in df_imputed.columns:
-        raise ValueError(f"列 '{column}' 不在DataFrame中")
+    df_imputed = _prepare_frame(df, column, inplace)
+    if dtype is not None and df_imputed[column].dtype != dtype:
+        df_imputed[column] = df_imputed[column].astype(dtype)
     
     # 记录原始缺失值信息
     original_missing = df_imputed[column].isna().sum()
@@ -37,32 +80,32 @@ def linear_impute(df: pd.DataFrame,
     print(f"开始插值处理: 列 '{column}' 有 {original_missing} 个缺失值")
     
     # 如果设置了最大连续缺失限制
+    protect = None
     if max_gap is not None and max_gap > 0:
-        # 识别连续缺失的段落
-        mask = df_imputed[column].isna()
-        groups = (mask != mask.shift()).cumsum()
+        # 识别连续缺失的段落（向量化的游程检测）
+        mask = df_imputed[column].isna().to_numpy()
+        starts, ends = _nan_runs(mask)
+        too_long = (ends - starts) > max_gap
         
-        for group_id, group in mask.groupby(groups):
-            if group.any():  # 这是一个缺失值段落
-                gap_length = group.sum()
-                
-                if gap_length > max_gap:
-                    # 标记这些位置为特殊值（或保持NaN）
-                    indices = group[group].index
-                    print(f"  跳过 {gap_length} 个连续缺失值（位置 {indices[0]}-{indices[-1]}，超过最大限制 {max_gap}）")
-                    # 保持为NaN，不进行插值
+        if too_long.any():
+            index = df_imputed.index
+            for start, end in zip(starts[too_long], ends[too_long]):
+                print(f"  跳过 {end - start} 个连续缺失值（位置 {index[start]}-{index[end - 1]}，超过最大限制 {max_gap}）")
+            # 这些位置插值后恢复为NaN，不进行插值
+            protect = _runs_to_mask(mask.size, starts[too_long], ends[too_long])
     
     # 执行插值
     try:
         if method == 'time' and 'timestamp' in df_imputed.columns:
-            # 基于时间的插值
-            df_imputed.set_index('timestamp', inplace=True)
-            df_imputed[column] = df_imputed[column].interpolate(method='time')
-            df_imputed.reset_index(inplace=True)
+            # 基于时间的插值：只为目标列临时挂上时间索引，不改动整表的索引和列顺序
+            series = df_imputed[column]
+            timed = series.set_axis(pd.DatetimeIndex(df_imputed['timestamp']))
+            df_imputed[column] = timed.interpolate(method='time').to_numpy()
         elif method == 'linear':
             df_imputed[column] = df_imputed[column].interpolate(method='linear')
         elif method == 'pad':
-            df_imputed[column] = df_imputed[column].interpolate(method='pad')
+            # interpolate(method='pad')已被pandas弃用，直接前向填充
+            df_imputed[column] = df_imputed[column].ffill()
         elif method == 'nearest':
             df_imputed[column] = df_imputed[column].interpolate(method='nearest')
         else:
@@ -71,7 +114,12 @@ def linear_impute(df: pd.DataFrame,
     except Exception as e:
         print(f"插值过程中出错: {e}")
         print("使用前向填充作为备选方案")
-        df_imputed[column] = df_imputed[column].fillna(method='ffill').fillna(method='bfill')
+        # fillna(method=...)在新版pandas中已移除，改用ffill()/bfill()
+        df_imputed[column] = df_imputed[column].ffill().bfill()
+    
+    # 超过最大连续缺失限制的段落保持为NaN
+    if protect is not None:
+        df_imputed[column] = df_imputed[column].mask(protect)
     
     # 计算插值后的缺失值
     remaining_missing = df_imputed[column].isna().sum()
@@ -82,10 +130,129 @@ def linear_impute(df: pd.DataFrame,
     return df_imputed
 
 
+def hour_of_day(df: pd.DataFrame) -> np.ndarray:
+    """
+    取出timestamp列对应的小时(0-23)，时间戳缺失的行记为-1
+
+    无时区的datetime64列直接转为按小时计的整数再对24取模，不经过 .dt.hour 访问器；
+    对同一DataFrame的多列做季节性插值时，可先调用一次，再通过 advanced_impute 的 hours 参数复用
+    """
+    ts = df['timestamp']
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    if pd.api.types.is_datetime64_dtype(ts):
+        as_hours = ts.to_numpy().astype('datetime64[h]')
+        hours = (as_hours.astype(np.int64) % 24).astype(np.int8)
+        hours[np.isnat(as_hours)] = -1
+    else:
+        # 带时区的时间戳按当地时间取小时
+        hours = ts.dt.hour.fillna(-1).to_numpy(dtype=np.int8)
+    return hours
+
+
+def _hourly_medians(hours: np.ndarray, vals: np.ndarray) -> np.ndarray:
+    """
+    按小时(0-23)分组求中位数，结果与 groupby('hour').median() 一致
+
+    一次lexsort按(小时, 值)排序，各小时的起止位置由bincount得到，
+    中位数直接按位置取出，不需要逐小时扫描整列
+    """
+    valid = (hours >= 0) & ~np.isnan(vals)
+    h = hours[valid]
+    v = vals[valid].astype(np.float64)
+    v_sorted = v[np.lexsort((v, h))]
+
+    counts = np.bincount(h, minlength=24)
+    starts = np.cumsum(counts) - counts
+    medians = np.full(counts.size, np.nan)
+    has = counts > 0
+    lo = starts[has] + (counts[has] - 1) // 2
+    hi = starts[has] + counts[has] // 2
+    medians[has] = (v_sorted[lo] + v_sorted[hi]) / 2
+    return medians
+
+
+def _prepare_many(df: pd.DataFrame, columns, inplace: bool):
+    """
+    多列插值的公共准备：确定待插值的列并准备结果DataFrame
+
+    columns为None时选择所有含缺失值的数值型列；无列可处理时打印提示
+
+    Returns:
+        (列名列表, 结果DataFrame)
+    """
+    if columns is None:
+        numeric = df.select_dtypes(include=[np.number])
+        columns = numeric.columns[numeric.isna().any().to_numpy()]
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError(f"列 '{column}' 不在DataFrame中")
+    cols = list(columns)
+
+    result = df if inplace else df.copy(deep=False)
+    if not cols:
+        print("没有需要插值的列，跳过插值")
+    return cols, result
+
+
+def _print_many_summary(cols, original_missing, remaining_missing) -> None:
+    """逐列打印多列插值的处理结果"""
+    for col, before, after in zip(cols, original_missing, remaining_missing):
+        print(f"列 '{col}': 处理了 {before - after} 个缺失值，剩余 {after} 个缺失值")
+
+
+def linear_impute_many(df: pd.DataFrame,
+                       columns=None,
+                       max_gap: Optional[int] = 5,
+                       inplace: bool = False) -> pd.DataFrame:
+    """
+    对多列一次性做线性插值，效果等同于对每列分别调用 linear_impute(method='linear')
+
+    所有列组成一个子表做一次 interpolate，超长缺失段落的保护掩码也对所有列一次求出，
+    不必逐列调用、逐列复制
+
+    Args:
+        df: 包含缺失值的DataFrame
+        columns: 需要插值的列，None表示所有含缺失值的数值型列
+        max_gap: 最大连续缺失值数量，超过此数量的连续缺失不进行插值，None表示无限制
+        inplace: 是否直接修改传入的DataFrame
+
+    Returns:
+        插值后的DataFrame
+    """
+    cols, result = _prepare_many(df, columns, inplace)
+    if not cols:
+        return result
+
+    block = df[cols]
+    mask = block.isna().to_numpy()
+    original_missing = mask.sum(axis=0)
+    filled = block.interpolate(method='linear', axis=0)
+
+    if max_gap is not None and max_gap > 0:
+        # 各列按列优先展开成一维，列与列之间插入一个非缺失的分隔位，
+        # 这样一维游程检测得到的段落不会跨列，可直接复用 _nan_runs/_runs_to_mask
+        n_rows = mask.shape[0]
+        padded = np.zeros((len(cols), n_rows + 1), dtype=bool)
+        padded[:, :n_rows] = mask.T
+        flat = padded.ravel()
+        starts, ends = _nan_runs(flat)
+        too_long = (ends - starts) > max_gap
+        if too_long.any():
+            protect = _runs_to_mask(flat.size, starts[too_long], ends[too_long])
+            filled = filled.mask(protect.reshape(padded.shape)[:, :n_rows].T)
+
+    result[cols] = filled
+    _print_many_summary(cols, original_missing, filled.isna().to_numpy().sum(axis=0))
+    return result
+
+
 def advanced_impute(df: pd.DataFrame,
                     column: str = 'temperature',
                     strategy: str = 'seasonal',
-                    seasonal_period: int = 24) -> pd.DataFrame:
+                    seasonal_period: int = 24,
+                    inplace: bool = False,
+                    hours: Optional[np.ndarray] = None) -> pd.DataFrame:
     """
     高级插值方法，考虑季节性等因素
     
@@ -94,34 +261,37 @@ def advanced_impute(df: pd.DataFrame,
         column: 需要插值的列名
         strategy: 插值策略 ('seasonal', 'rolling_mean', 'spline')
         seasonal_period: 季节性周期（小时数）
+        inplace: 是否直接修改传入的DataFrame
+        hours: 可选，预先由 hour_of_day(df) 求出的小时数组，仅seasonal策略使用
     
     Returns:
         插值后的DataFrame
     """
-    df_imputed = df.copy()
-    
-    if column not in df_imputed.columns:
-        raise ValueError(f"列 '{column}' 不在DataFrame中")
+    df_imputed = _prepare_frame(df, column, inplace)
     
     if strategy == 'seasonal' and 'timestamp' in df_imputed.columns:
         print(f"使用季节性插值（周期: {seasonal_period} 小时）")
         
-        # 提取小时信息
-        df_imputed['hour'] = pd.to_datetime(df_imputed['timestamp']).dt.hour
+        # 提取小时信息（时间戳缺失的行记为-1，不参与统计和填充）
+        if hours is None:
+            hours = hour_of_day(df_imputed)
+        elif len(hours) != len(df_imputed):
+            raise ValueError(f"hours长度 {len(hours)} 与数据行数 {len(df_imputed)} 不一致")
+        series = df_imputed[column]
+        vals = series.to_numpy(dtype=series.dtype if series.dtype.kind == 'f' else np.float64, copy=True)
         
         # 计算每小时的典型值（中位数）
-        hourly_median = df_imputed.groupby('hour')[column].median()
+        hourly_median = _hourly_medians(hours, vals)
         
-        # 对缺失值使用对应小时的典型值填充
-        for hour in range(24):
-            hour_mask = (df_imputed['hour'] == hour) & df_imputed[column].isna()
-            if hour_mask.any():
-                if not pd.isna(hourly_median[hour]):
-                    df_imputed.loc[hour_mask, column] = hourly_median[hour]
+        # 对缺失值使用对应小时的典型值填充（该小时无有效值时中位数为NaN，保持缺失）
+        fill = np.isnan(vals) & (hours >= 0)
+        vals[fill] = hourly_median[hours[fill]]
         
-        # 剩余的使用线性插值
-        df_imputed[column] = df_imputed[column].interpolate(method='linear')
-        df_imputed.drop(columns=['hour'], inplace=True)
+        # 剩余的使用线性插值（按小时填充已覆盖全部缺失时跳过这一遍扫描）
+        filled = pd.Series(vals, index=df_imputed.index)
+        if np.isnan(vals).any():
+            filled = filled.interpolate(method='linear')
+        df_imputed[column] = filled
         
     elif strategy == 'rolling_mean':
         print("使用滚动均值插值")
@@ -141,6 +311,91 @@ def advanced_impute(df: pd.DataFrame,
     return df_imputed
 
 
+def _impute_column(args):
+    """
+    进程池工作函数：对单列ndarray插值，超过max_gap的连续缺失段落保持为NaN
+
+    只接收和返回ndarray，进程间只需序列化数值数组，不传递DataFrame；返回值保持输入的浮点类型。
+    插值失败（如'nearest'缺少scipy）时改用前向填充，并把错误信息返回给主进程打印
+
+    Returns:
+        (插值结果, 错误信息或None)
+    """
+    arr, max_gap, method = args
+    series = pd.Series(arr)
+    error = None
+    try:
+        if method == 'pad':
+            filled = series.ffill()
+        else:
+            filled = series.interpolate(method=method)
+    except (ImportError, ValueError) as e:
+        error = str(e)
+        filled = series.ffill().bfill()
+    out = filled.to_numpy(dtype=arr.dtype, copy=True)
+
+    if max_gap is not None and max_gap > 0:
+        starts, ends = _nan_runs(np.isnan(arr))
+        too_long = (ends - starts) > max_gap
+        if too_long.any():
+            out[_runs_to_mask(arr.size, starts[too_long], ends[too_long])] = np.nan
+    return out, error
+
+
+def parallel_impute(df: pd.DataFrame,
+                    columns=None,
+                    max_gap: Optional[int] = 5,
+                    method: str = 'linear',
+                    max_workers: Optional[int] = None,
+                    inplace: bool = False) -> pd.DataFrame:
+    """
+    多列插值：各列互不依赖，分发到进程池并行处理
+
+    Args:
+        df: 包含缺失值的DataFrame
+        columns: 需要插值的列，None表示所有含缺失值的数值型列
+        max_gap: 最大连续缺失值数量，超过此数量的连续缺失不进行插值
+        method: 插值方法 ('linear', 'pad', 'nearest')，不依赖时间索引
+        max_workers: 进程数，None表示使用CPU核数；为1时在当前进程顺序执行
+        inplace: 是否直接修改传入的DataFrame
+
+    Returns:
+        插值后的DataFrame
+    """
+    if method not in ('linear', 'pad', 'nearest'):
+        raise ValueError(f"parallel_impute 不支持插值方法 '{method}'")
+    cols, result = _prepare_many(df, columns, inplace)
+    if not cols:
+        return result
+
+    # float32/float64列保持原类型传入工作进程，其他类型转换为float64
+    tasks = [(as_float_array(df[col]), max_gap, method) for col in cols]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(cols))
+    if workers == 1:
+        # 单列或单进程时直接计算，省去进程启动与数据序列化的开销
+        results = [_impute_column(task) for task in tasks]
+    else:
+        # 按进程数均分任务；chunksize过大会把所有列打包给同一个进程
+        chunksize = max(1, len(cols) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_impute_column, tasks, chunksize=chunksize))
+
+    outputs = []
+    for col, (out, error) in zip(cols, results):
+        if error is not None:
+            print(f"列 '{col}' 插值过程中出错: {error}")
+            print("使用前向填充作为备选方案")
+        outputs.append(out)
+
+    # 各列结果一次性写回（各列保留自己的浮点类型）
+    result[cols] = pd.DataFrame(dict(zip(cols, outputs)), index=df.index)
+    _print_many_summary(cols,
+                        [int(np.isnan(arr).sum()) for arr, _, _ in tasks],
+                        [int(np.isnan(out).sum()) for out in outputs])
+    return result
+
+
 def get_missing_stats(df: pd.DataFrame, column: str = 'temperature') -> Dict[str, Any]:
     """
     获取缺失值统计信息
@@ -161,14 +416,9 @@ def get_missing_stats(df: pd.DataFrame, column: str = 'temperature') -> Dict[str
     
     # 连续缺失段落分析
     if total_missing > 0:
-        # 识别连续缺失段落
-        groups = (missing_mask != missing_mask.shift()).cumsum()
-        gap_lengths = []
-        
-        for group_id, group in missing_mask.groupby(groups):
-            if group.any():  # 这是一个缺失值段落
-                gap_length = group.sum()
-                gap_lengths.append(gap_length)
+        # 识别连续缺失段落（向量化的游程检测，段落长度即起止位置之差）
+        starts, ends = _nan_runs(missing_mask.to_numpy())
+        gap_lengths = (ends - starts).tolist()
         
         stats = {
             "total_missing": int(total_missing),
@@ -198,7 +448,8 @@ def handle_missing_values(df: pd.DataFrame,
                          column: str = 'temperature',
                          method: str = 'linear',
                          max_gap: Optional[int] = 10,
-                         report: bool = True) -> pd.DataFrame:
+                         report: bool = True,
+                         inplace: bool = False) -> pd.DataFrame:
     """
     缺失值处理主函数
     
@@ -208,6 +459,7 @@ def handle_missing_values(df: pd.DataFrame,
         method: 处理方法 ('linear', 'seasonal', 'rolling_mean', 'spline')
         max_gap: 最大连续缺失限制
         report: 是否打印报告
+        inplace: 是否直接修改传入的DataFrame（调用方已自行复制时可避免再次复制）
     
     Returns:
         处理后的DataFrame
@@ -227,12 +479,12 @@ def handle_missing_values(df: pd.DataFrame,
     
     # 选择插值方法
     if method in ['linear', 'pad', 'nearest', 'time']:
-        result_df = linear_impute(df, column, max_gap, method)
+        result_df = linear_impute(df, column, max_gap, method, inplace=inplace)
     elif method in ['seasonal', 'rolling_mean', 'spline']:
-        result_df = advanced_impute(df, column, method)
+        result_df = advanced_impute(df, column, method, inplace=inplace)
     else:
         warnings.warn(f"未知方法 '{method}'，使用默认线性插值")
-        result_df = linear_impute(df, column, max_gap, 'linear')
+        result_df = linear_impute(df, column, max_gap, 'linear', inplace=inplace)
     
     if report:
         # 处理后统计
@@ -271,8 +523,8 @@ if __name__ == "__main__":
     
     # 测试线性插值
     print("\n1. 测试线性插值:")
-    df_linear = handle_missing_values(test_df.copy(), method='linear', max_gap=5)
+    df_linear = handle_missing_values(test_df.copy(), method='linear', max_gap=5, inplace=True)
     
     # 测试季节性插值
     print("\n2. 测试季节性插值:")
-    df_seasonal = handle_missing_values(test_df.copy(), method='seasonal')
\ No newline at end of file
+    df_seasonal = handle_missing_values(test_df.copy(), method='seasonal', inplace=True)
\ No newline at end of file
@@ -1,26 +1,115 @@
 import pandas as pd
 import os
 
-def load_weather_data(file_path):
+# 常见气象要素的列类型：显式声明可跳过类型推断，float32 足以覆盖气象数值范围
+WEATHER_DTYPES = {
+    'temperature': 'float32',
+    'humidity': 'float32',
+    'pressure': 'float32',
+    'wind_speed': 'float32',
+}
+TIMESTAMP_COLUMN = 'timestamp'
+
+# 分块读取时每块的目标内存大小（约256MB）
+DEFAULT_CHUNK_BYTES = 256 * 1024 * 1024
+
+try:
+    import pyarrow  # noqa: F401  多线程CSV解析器，可选依赖
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def _csv_columns(file_path):
+    """
+    只读取CSV表头，返回列名
+    """
+    return pd.read_csv(file_path, nrows=0).columns
+
+
+def _csv_read_options(columns):
+    """
+    根据CSV表头的列名生成 read_csv 的类型参数(只声明文件中实际存在的列)
+    """
+    options = {'dtype': {col: dtype for col, dtype in WEATHER_DTYPES.items() if col in columns}}
+    if TIMESTAMP_COLUMN in columns:
+        options['parse_dates'] = [TIMESTAMP_COLUMN]
+    return options
+
+
+def _apply_weather_dtypes(df):
+    """
+    将已知气象要素列转换为 WEATHER_DTYPES 中声明的类型
+    """
+    for col, dtype in WEATHER_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype, copy=False)
+    return df
+
+
+def _estimate_chunksize(columns, options, target_bytes):
+    """
+    按目标内存大小估算每块行数（已声明类型的列按其字节数，其余列按8字节计）
+    """
+    dtypes = options['dtype']
+    row_bytes = sum(pd.api.types.pandas_dtype(dtypes[col]).itemsize if col in dtypes else 8
+                    for col in columns)
+    return max(1, target_bytes // max(row_bytes, 1))
+
+
+def iter_weather_chunks(file_path, chunksize=None, target_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    分块读取大型CSV气象数据，逐块产出DataFrame，峰值内存只取决于块大小
+    参数:
+        file_path (str):CSV文件路径
+        chunksize (int):每块行数，None表示按 target_bytes 自动估算
+        target_bytes (int):自动估算时每块的目标内存大小
+    产出:
+        pandas.DataFrame:每次一个数据块
+    说明:
+        pyarrow引擎不支持分块读取，这里固定使用C引擎；
+        需要完整数据时可用 pd.concat(iter_weather_chunks(...), ignore_index=True) 合并
+    """
+    # 表头只读一次，类型参数和块大小估算共用
+    columns = _csv_columns(file_path)
+    options = _csv_read_options(columns)
+    if chunksize is None:
+        chunksize = _estimate_chunksize(columns, options, target_bytes)
+    with pd.read_csv(file_path, chunksize=chunksize, engine='c', **options) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def load_weather_data(file_path, chunksize=None):
     """
     加载气象数据文件 (工程增强版)
     参数:
-        file_path (str):数据文件的路径 (支持.csv或..xlsx)
+        file_path (str):数据文件的路径 (支持.csv、.xlsx或.parquet)
+        chunksize (int):指定时按块读取CSV，返回DataFrame生成器(见 iter_weather_chunks)
     返回:
-        pandas.DataFrame:加载后的数据框
+        pandas.DataFrame:加载后的数据框 (指定chunksize时为逐块产出的生成器)
     异常：
         会抛出清晰的错误信息,帮助快速定位问题
     """
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"错误：文件'{file_path}'不存在")
+    if chunksize is not None:
+        if not file_path.endswith('.csv'):
+            raise ValueError("分块读取仅支持 .csv 文件。")
+        return iter_weather_chunks(file_path, chunksize=chunksize)
     try:
         # === 你原有的核心逻辑 ===
         if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            # 显式类型 + 解析时间列，一次完成带类型的解析
+            df = pd.read_csv(file_path, engine=CSV_ENGINE, **_csv_read_options(_csv_columns(file_path)))
         elif file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
+            # openpyxl 以只读模式流式读取工作表
+            df = _apply_weather_dtypes(pd.read_excel(file_path, engine='openpyxl'))
+        elif file_path.endswith('.parquet'):
+            # Parquet自带列类型，无需文本解析和类型推断
+            df = _apply_weather_dtypes(pd.read_parquet(file_path, engine='pyarrow'))
         else:
-            raise ValueError("不支持的文件格式! 请提供 .csv 或 .xlsx 文件。")
+            raise ValueError("不支持的文件格式! 请提供 .csv、.xlsx 或 .parquet 文件。")
         # === 你的原始逻辑结束 ===
     except pd.errors.EmptyDataError:
          raise pd.errors.EmptyDataError(f"文件 '{file_path}' 为空，请检查文件内容。")
@@ -1,59 +1,127 @@
 # normalization.py - 数据标准化模块
 import pandas as pd
 import numpy as np
+import warnings
 
-def zscore_normalize(data, columns=None):
+from numeric_utils数值工具 import numeric_block, resolve_block_columns
+
+
+def _polars_normalize(data, cols, build_expr):
+    """
+    用Polars惰性查询并行计算各列标准化结果，返回形状为 (行数, 列数) 的ndarray
+
+    只转换待处理的列；进出Polars各转换一次，对外仍保持pandas接口
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError("backend='polars' 需要安装 polars: pip install polars")
+    
+    lazy_frame = pl.from_pandas(data[cols], rechunk=True).lazy()
+    normalized = lazy_frame.with_columns([build_expr(pl, col).alias(col) for col in cols]).collect()
+    return normalized.to_numpy().astype(np.float64, copy=False)
+
+
+def _zscore_expr(pl, col):
+    """Polars表达式：(x - mean) / std，标准差为0时统一设为0"""
+    x = pl.col(col)
+    return pl.when(x.std() == 0).then(pl.lit(0.0)).otherwise((x - x.mean()) / x.std())
+
+
+def _minmax_expr(pl, col):
+    """Polars表达式：(x - min) / (max - min)，极差为0时统一设为0"""
+    x = pl.col(col)
+    range_val = x.max() - x.min()
+    return pl.when(range_val == 0).then(pl.lit(0.0)).otherwise((x - x.min()) / range_val)
+
+
+def _prepare_result(data, inplace):
+    """inplace=True 直接写回data；否则浅复制，各列整列赋值替换，不改动原DataFrame"""
+    return data if inplace else data.copy(deep=False)
+
+
+def _check_backend(backend, block=None, dtype=None):
+    if backend not in ('numpy', 'polars'):
+        raise ValueError(f"不支持的计算后端: {backend}，请使用 numpy 或 polars")
+    if backend == 'polars' and (block is not None or dtype is not None):
+        raise ValueError("block 和 dtype 参数仅支持 numpy 后端")
+
+
+def zscore_normalize(data, columns=None, backend='numpy', inplace=False, block=None, dtype=None):
     """
     Z-Score标准化:将数据转换为均值为0,标准差为1的分布
     
     适用场景：数据符合正态分布，或有离群点的情况
     公式：(x - mean) / std
+    backend: 'numpy'(默认) 或 'polars'(多线程列式计算，适合宽表)
+    inplace: 是否直接修改传入的DataFrame
+    block: 可选，预先提取的 data[columns] 浮点矩阵，按原类型直接使用（仅numpy后端，免去重复提取）
+    dtype: numpy后端的计算类型（None时的规则见 numeric_block）
     """
-    # 如果没有指定列，自动选择所有数值型列
-    if columns is None:
-        columns = data.select_dtypes(include=[np.number]).columns
-    
-    result = data.copy()
-    
-    for col in columns:
-        if col in data.columns:
-            mean_val = data[col].mean()  # 计算均值
-            std_val = data[col].std()    # 计算标准差
-            
-            # 避免除零错误（当标准差为0时，所有值相同）
-            if std_val != 0:
-                result[col] = (data[col] - mean_val) / std_val
-            else:
-                # 所有值相同的情况，统一设为0
-                result[col] = 0
+    _check_backend(backend, block, dtype)
+    cols = resolve_block_columns(data, columns, block)
+    result = _prepare_result(data, inplace)
+    if not cols:
+        return result
+    
+    if backend == 'polars':
+        result[cols] = _polars_normalize(data, cols, _zscore_expr)
+        return result
+    
+    block = numeric_block(data, cols, block, dtype)
+    
+    # 全缺失的列均值/标准差为NaN（与pandas一致），忽略numpy的空切片警告
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        # float64累加保证精度，结果再转回计算类型，避免整块数据被提升为float64
+        mean_vals = np.nanmean(block, axis=0, dtype=np.float64)         # 计算各列均值
+        std_vals = np.nanstd(block, axis=0, ddof=1, dtype=np.float64)   # 计算各列样本标准差
+    
+    # 避免除零错误（当标准差为0时，所有值相同）
+    zero_std = std_vals == 0
+    scale = np.where(zero_std, 1.0, std_vals).astype(block.dtype)
+    normalized = (block - mean_vals.astype(block.dtype)) / scale
+    # 所有值相同的情况，统一设为0
+    normalized[:, zero_std] = 0
     
+    result[cols] = normalized
     return result
 
 
-def minmax_normalize(data, columns=None):
+def minmax_normalize(data, columns=None, backend='numpy', inplace=False, block=None, dtype=None):
     """
     Min-Max标准化:将数据缩放到[0,1]区间
     
     适用场景：数据有明确边界，需要保留原始分布形态
     公式：(x - min) / (max - min)
+    backend: 'numpy'(默认) 或 'polars'(多线程列式计算，适合宽表)
+    inplace: 是否直接修改传入的DataFrame
+    block: 可选，预先提取的 data[columns] 浮点矩阵，按原类型直接使用（仅numpy后端，免去重复提取）
+    dtype: numpy后端的计算类型（None时的规则见 numeric_block）
     """
-    # 如果没有指定列，自动选择所有数值型列
-    if columns is None:
-        columns = data.select_dtypes(include=[np.number]).columns
-    
-    result = data.copy()
-    
-    for col in columns:
-        if col in data.columns:
-            min_val = data[col].min()    # 计算最小值
-            max_val = data[col].max()    # 计算最大值
-            range_val = max_val - min_val  # 计算极差
-            
-            # 避免除零错误（当所有值相同时，极差为0）
-            if range_val != 0:
-                result[col] = (data[col] - min_val) / range_val
-            else:
-                # 所有值相同的情况，统一设为0
-                result[col] = 0
-    
-    return result
\ No newline at end of file
+    _check_backend(backend, block, dtype)
+    cols = resolve_block_columns(data, columns, block)
+    result = _prepare_result(data, inplace)
+    if not cols:
+        return result
+    
+    if backend == 'polars':
+        result[cols] = _polars_normalize(data, cols, _minmax_expr)
+        return result
+    
+    block = numeric_block(data, cols, block, dtype)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        min_vals = np.nanmin(block, axis=0)    # 计算各列最小值
+        max_vals = np.nanmax(block, axis=0)    # 计算各列最大值
+    range_vals = max_vals - min_vals           # 计算极差
+    
+    # 避免除零错误（当所有值相同时，极差为0）
+    zero_range = range_vals == 0
+    normalized = (block - min_vals) / np.where(zero_range, 1.0, range_vals).astype(block.dtype)
+    # 所有值相同的情况，统一设为0
+    normalized[:, zero_range] = 0
+    
+    result[cols] = normalized
+    return result
@@ -0,0 +1,52 @@
+# numeric_utils.py - 数值矩阵的公共工具（只依赖pandas/numpy，供标准化、异常检测、插值模块共用）
+import numpy as np
+import pandas as pd
+
+
+def as_float_array(series: pd.Series) -> np.ndarray:
+    """取出浮点ndarray：float32/float64列直接复用底层数据，其他类型转换为float64"""
+    arr = series.to_numpy()
+    if arr.dtype.kind != 'f':
+        arr = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return arr
+
+
+def resolve_block_columns(df: pd.DataFrame, columns=None, block=None) -> list:
+    """
+    确定待处理的数值列
+
+    Args:
+        df: 输入DataFrame
+        columns: 待处理的列，None表示所有数值型列（只保留df中实际存在的列）
+        block: 可选，调用方预先提取的 df[columns] 矩阵；传入时列与矩阵一一对应，不再推断列类型
+
+    Returns:
+        列名列表
+    """
+    if block is not None:
+        if columns is None:
+            raise ValueError("传入block时必须同时指定columns")
+        cols = list(columns)
+        if block.ndim != 2 or block.shape != (len(df), len(cols)):
+            raise ValueError(f"block形状 {block.shape} 与数据 ({len(df)}, {len(cols)}) 不一致")
+        return cols
+
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    return [col for col in columns if col in df.columns]
+
+
+def numeric_block(df: pd.DataFrame, cols, block=None, dtype=None) -> np.ndarray:
+    """
+    取出 df[cols] 组成的二维浮点矩阵(一次性提取，后续按列向量化计算)
+
+    dtype为None时：调用方传入的block按原类型使用；否则所有列均为float32时按float32提取
+    （内存带宽减半，统计量由调用方以float64累加），其余情况按float64提取。
+    显式指定dtype时按该类型提取或转换
+    """
+    if block is not None:
+        return np.asarray(block) if dtype is None else np.asarray(block, dtype=dtype)
+    if dtype is None:
+        all_float32 = bool(cols) and (df[cols].dtypes == np.float32).all()
+        dtype = np.float32 if all_float32 else np.float64
+    return df[cols].to_numpy(dtype=dtype, na_value=np.nan)
@@ -1,6 +1,94 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
+import warnings
+from typing import Dict, Optional, Tuple
+
+from numeric_utils数值工具 import as_float_array, numeric_block, resolve_block_columns
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba为可选加速依赖，未安装时回退到NumPy实现
+    njit = None
+
+# 数据量小于该值时NumPy表达式更快（并行内核有线程调度开销，首次调用还要JIT编译）
+_KERNEL_MIN_SIZE = 1_000_000
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _detect_kernel(x, lower, upper, out):
+        """单次遍历同时完成上下界比较，直接写入预分配的布尔数组"""
+        for i in prange(x.size):
+            out[i] = (x[i] < lower) or (x[i] > upper)
+
+    @njit(parallel=True, cache=True)
+    def _znorm_3sigma_kernel(A, sigma_level):
+        """
+        按列并行：Welford在线算法一次遍历求均值/方差，第二遍写出z分数并统计|z|>σ倍数的个数
+
+        不开启fastmath，保证NaN的判断和传播语义不变
+        """
+        n, k = A.shape
+        out = np.empty_like(A)
+        mean = np.full(k, np.nan)
+        std = np.full(k, np.nan)
+        counts = np.zeros(k, dtype=np.int64)
+        for j in prange(k):
+            cnt = 0
+            mu = 0.0
+            m2 = 0.0
+            for i in range(n):
+                x = A[i, j]
+                if not np.isnan(x):
+                    cnt += 1
+                    delta = x - mu
+                    mu += delta / cnt
+                    m2 += delta * (x - mu)
+            if cnt > 0:
+                mean[j] = mu
+            if cnt > 1:
+                std[j] = np.sqrt(m2 / (cnt - 1))  # 样本标准差(ddof=1)
+
+            sd = std[j]
+            if sd == 0:
+                # 所有值相同：z分数统一设为0，不存在异常值
+                for i in range(n):
+                    out[i, j] = 0.0
+            else:
+                c = 0
+                for i in range(n):
+                    z = (A[i, j] - mean[j]) / sd
+                    out[i, j] = z
+                    if abs(z) > sigma_level:
+                        c += 1
+                counts[j] = c
+        return out, mean, std, counts
+else:
+    _detect_kernel = None
+    _znorm_3sigma_kernel = None
+
+
+def mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """
+    由一遍求和与平方和得到均值和样本标准差(ddof=1，与pandas一致)
+
+    values为不含NaN的一维数组；float32数据也用float64累加，保证数值稳定。
+    无样本时均值为NaN，少于2个样本时标准差为NaN
+    """
+    n = values.size
+    s1 = values.sum(dtype=np.float64)
+    s2 = np.einsum('i,i->', values, values, dtype=np.float64)  # 平方和，不产生 values**2 临时数组
+    mean = s1 / n if n > 0 else np.nan
+    # 舍入误差可能使方差略小于0
+    std = np.sqrt(max(s2 - s1 * s1 / n, 0.0) / (n - 1)) if n > 1 else np.nan
+    return mean, std
+
+
+def _resolve_block(df: pd.DataFrame, columns, block, dtype=None):
+    """确定待处理的列及其浮点矩阵（调用方已提取过矩阵时直接复用）"""
+    cols = resolve_block_columns(df, columns, block)
+    return cols, numeric_block(df, cols, block, dtype)
+
 
 class ThreeSigmaDetector:
     """3σ异常检测器 - 天擎系统质检核心"""
@@ -10,10 +98,10 @@ class ThreeSigmaDetector:
         self.thresholds = {}
         
     def fit(self, data_series: pd.Series) -> None:
-        """计算数据的3σ阈值"""
-        mean = data_series.mean()
-        std = data_series.std()
-        
+        """计算数据的3σ阈值（单次遍历求和与平方和，避免均值、标准差各扫描一遍）"""
+        arr = as_float_array(data_series)
+        mean, std = mean_std(arr[~np.isnan(arr)])
+
         self.thresholds = {
             'mean': mean,
             'std': std,
@@ -22,13 +110,21 @@ class ThreeSigmaDetector:
         }
     
     def detect(self, data_series: pd.Series) -> pd.Series:
-        """检测异常值"""
+        """检测异常值（阈值只在首次调用时计算，之后复用）"""
         if not self.thresholds:
             self.fit(data_series)
-            
-        anomalies = (data_series < self.thresholds['lower_bound']) | \
-                   (data_series > self.thresholds['upper_bound'])
-        return anomalies
+
+        # 上下界先取到局部变量，之后的比较不再查字典；每次读取，外部修改阈值后立即生效
+        lower = float(self.thresholds['lower_bound'])
+        upper = float(self.thresholds['upper_bound'])
+        arr = as_float_array(data_series)
+
+        if _detect_kernel is not None and arr.size >= _KERNEL_MIN_SIZE:
+            anomalies = np.empty(arr.size, dtype=np.bool_)
+            _detect_kernel(arr, lower, upper, anomalies)
+        else:
+            anomalies = (arr < lower) | (arr > upper)
+        return pd.Series(anomalies, index=data_series.index, name=data_series.name)
     
     def generate_report(self, data_series: pd.Series) -> Dict:
         """生成质检报告"""
@@ -40,4 +136,102 @@ class ThreeSigmaDetector:
             'anomaly_rate': anomalies.mean(),
             'thresholds': self.thresholds,
             'anomaly_indices': data_series[anomalies].index.tolist()
-        }
\ No newline at end of file
+        }
+
+
+def three_sigma_detect(df: pd.DataFrame,
+                       columns=None,
+                       sigma_level: int = 3,
+                       block: Optional[np.ndarray] = None,
+                       dtype=None) -> Dict[str, Dict]:
+    """
+    多列3σ异常检测：所有待检测列组成一个矩阵，一次完成均值、标准差和上下界比较
+
+    Args:
+        df: 输入DataFrame
+        columns: 待检测的列，None表示所有数值型列
+        sigma_level: σ倍数
+        block: 可选，预先提取的 df[columns] 浮点矩阵，按原类型直接使用，多个步骤间复用以免重复提取
+        dtype: 提取矩阵的浮点类型（None时的规则见 numeric_block），均值/标准差总以float64累加
+
+    Returns:
+        {列名: {'mask', 'count', 'mean', 'std', 'upper_bound', 'lower_bound'}}
+        其中mask为与df同索引的布尔序列，True表示异常值
+    """
+    cols, block = _resolve_block(df, columns, block, dtype)
+
+    # 全缺失的列均值/标准差为NaN，比较结果全为False，忽略numpy的空切片警告
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(block, axis=0, dtype=np.float64)
+        std = np.nanstd(block, axis=0, ddof=1, dtype=np.float64)  # 与ThreeSigmaDetector一致，使用样本标准差
+    upper = mean + sigma_level * std
+    lower = mean - sigma_level * std
+
+    mask_mat = (block > upper) | (block < lower)
+    counts = mask_mat.sum(axis=0)
+
+    outlier_info = {}
+    for i, col in enumerate(cols):
+        outlier_info[col] = {
+            'mask': pd.Series(mask_mat[:, i], index=df.index, name=col),
+            'count': int(counts[i]),
+            'mean': float(mean[i]),
+            'std': float(std[i]),
+            'upper_bound': float(upper[i]),
+            'lower_bound': float(lower[i]),
+        }
+    return outlier_info
+
+
+def _znorm_3sigma_numpy(block: np.ndarray, sigma_level: float) -> Tuple[np.ndarray, ...]:
+    """_znorm_3sigma_kernel的NumPy回退实现，语义保持一致"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(block, axis=0)
+        std = np.nanstd(block, axis=0, ddof=1)
+
+    zero_std = std == 0
+    out = (block - mean) / np.where(zero_std, 1.0, std)
+    out[:, zero_std] = 0
+    counts = np.count_nonzero(np.abs(out) > sigma_level, axis=0)
+    return out, mean, std, counts
+
+
+def znorm_three_sigma(df: pd.DataFrame,
+                      columns=None,
+                      sigma_level: int = 3,
+                      block: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
+    """
+    Z-Score标准化与3σ异常计数融合为一次计算
+
+    结果与 zscore_normalize + three_sigma_detect 分别调用一致（同为样本标准差），
+    安装numba时使用按列并行的融合内核，否则回退到NumPy向量化实现
+
+    Args:
+        df: 输入DataFrame
+        columns: 待处理的列，None表示所有数值型列
+        sigma_level: σ倍数
+        block: 可选，预先提取的 df[columns] 浮点矩阵，按原类型直接使用，多个步骤间复用以免重复提取
+
+    Returns:
+        (标准化后的DataFrame, {列名: {'count', 'mean', 'std'}})
+    """
+    cols, block = _resolve_block(df, columns, block, np.float64)
+    result = df.copy(deep=False)  # 各列整列赋值替换，浅复制即可
+    if not cols:
+        return result, {}
+
+    # numba不识别pandas对象，使用列优先(Fortran序)的float64矩阵，按列遍历时内存连续
+    block = np.asfortranarray(block, dtype=np.float64)
+    if _znorm_3sigma_kernel is not None:
+        out, mean, std, counts = _znorm_3sigma_kernel(block, float(sigma_level))
+    else:
+        out, mean, std, counts = _znorm_3sigma_numpy(block, sigma_level)
+
+    result[cols] = out
+    outlier_info = {
+        col: {'count': int(counts[i]), 'mean': float(mean[i]), 'std': float(std[i])}
+        for i, col in enumerate(cols)
+    }
+    return result, outlier_info
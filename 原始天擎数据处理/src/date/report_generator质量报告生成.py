@@ -4,8 +4,41 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Optional, Dict, Any
+import io
 import os
 
+
+# 报告生成器只依赖pandas/numpy和标准库，可单独按路径加载，因此以下小工具在本模块内实现，
+# 不从 quality_check / imputation 导入（它们依赖同目录模块，quality_check 还会带入numba等可选依赖）
+
+def _as_float_array(series: pd.Series) -> np.ndarray:
+    """取出浮点ndarray：float32/float64列直接复用底层数据，其他类型转换为float64"""
+    arr = series.to_numpy()
+    if arr.dtype.kind != 'f':
+        arr = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return arr
+
+
+def _mean_std(values: np.ndarray):
+    """由一遍求和与平方和得到均值和样本标准差(ddof=1)，values不含NaN且至少有1个元素"""
+    n = values.size
+    s1 = values.sum(dtype=np.float64)
+    s2 = np.einsum('i,i->', values, values, dtype=np.float64)
+    std = np.sqrt(max(s2 - s1 * s1 / n, 0.0) / (n - 1)) if n > 1 else np.nan
+    return s1 / n, std
+
+
+def _gap_lengths(mask: np.ndarray) -> np.ndarray:
+    """
+    由缺失掩码求各连续缺失段落的长度
+
+    与 imputation 模块的 _nan_runs 是同一算法：对两端补0的掩码做差分，
+    取值变化的位置两两成对即为各段落的起止位置（左闭右开）
+    """
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.view(np.int8), 0]))
+    return edges[1::2] - edges[::2]
+
+
 class QualityReportGenerator:
     """
     生成气象数据质量报告(纯Python版本)
@@ -18,33 +51,67 @@ class QualityReportGenerator:
         Args:
             raw_df: 原始数据DataFrame
             cleaned_df: 清洗后的数据DataFrame
+
+        注意: 报告生成器只读取数据，不会修改传入的DataFrame，因此直接保存引用而不复制
         """
-        self.raw_df = raw_df.copy()
-        self.cleaned_df = cleaned_df.copy()
+        self.raw_df = raw_df
+        self.cleaned_df = cleaned_df
         self.report = {}
+        # 行数和列名只取一次，各报告部分直接复用
+        self._n_raw = len(raw_df)
+        self._n_clean = len(cleaned_df)
+        self._raw_columns = raw_df.columns.tolist()
+        # 按 (数据来源, 列名) 缓存单列的缺失掩码、非缺失值和统计量，各报告部分共用
+        self._cache = {}
+    
+    def _column_cache(self, source: str, column: str) -> Dict[str, Any]:
+        """
+        取出单列的缓存条目，首次访问时计算缺失掩码（每列只做一次isna）
+
+        Args:
+            source: 'raw' 或 'cleaned'，表示使用原始数据还是清洗后数据
+            column: 列名
+        """
+        key = (source, column)
+        entry = self._cache.get(key)
+        if entry is None:
+            df = self.raw_df if source == "raw" else self.cleaned_df
+            mask = df[column].isna().to_numpy()
+            entry = {"mask": mask, "n_missing": int(mask.sum())}
+            self._cache[key] = entry
+        return entry
+    
+    def _clean_values(self, source: str, column: str) -> np.ndarray:
+        """取出单列的非缺失值ndarray（复用缓存的缺失掩码）"""
+        entry = self._column_cache(source, column)
+        if "clean" not in entry:
+            df = self.raw_df if source == "raw" else self.cleaned_df
+            entry["clean"] = _as_float_array(df[column])[~entry["mask"]]
+        return entry["clean"]
     
-    def _get_missing_stats(self, df: pd.DataFrame, column: str = 'temperature') -> Dict[str, Any]:
+    def _get_missing_stats(self, source: str, column: str = 'temperature') -> Dict[str, Any]:
         """
         计算缺失值统计信息（独立函数，不依赖外部模块）
+
+        Args:
+            source: 'raw' 或 'cleaned'，表示使用原始数据还是清洗后数据
+            column: 列名
         """
+        df = self.raw_df if source == "raw" else self.cleaned_df
+        n_rows = self._n_raw if source == "raw" else self._n_clean
         if column not in df.columns:
             return {"error": f"列 '{column}' 不存在"}
         
-        missing_mask = df[column].isna()
-        total_missing = int(missing_mask.sum())
-        missing_rate = total_missing / len(df) if len(df) > 0 else 0
+        entry = self._column_cache(source, column)
+        mask_np = entry["mask"]
+        total_missing = entry["n_missing"]
+        missing_rate = total_missing / n_rows if n_rows > 0 else 0
         
         # 连续缺失段落分析
         if total_missing > 0:
             # 识别连续缺失段落
-            groups = (missing_mask != missing_mask.shift()).cumsum()
-            gap_lengths = []
-            
-            for group_id, group in missing_mask.groupby(groups):
-                if group.any():  # 这是一个缺失值段落
-                    gap_length = int(group.sum())
-                    gap_lengths.append(gap_length)
-            
+            gap_lengths = _gap_lengths(mask_np).tolist()
+
             stats = {
                 "total_missing": total_missing,
                 "missing_rate": float(missing_rate),
@@ -67,40 +134,58 @@ class QualityReportGenerator:
         
         return stats
     
+    def _col_stats(self, source: str, column: str) -> Dict[str, Any]:
+        """
+        计算单列的描述统计并缓存，供基础统计和异常值检测共用
+
+        一次取出非缺失值：分位数由一次 np.percentile 求出，
+        均值/标准差由一遍求和与平方和推出，避免对同一列反复扫描。
+
+        Args:
+            source: 'raw' 或 'cleaned'，表示使用原始数据还是清洗后数据
+            column: 列名
+        """
+        entry = self._column_cache(source, column)
+        if "stats" in entry:
+            return entry["stats"]
+
+        values = self._clean_values(source, column)
+        count = int(values.size)
+
+        if count == 0:
+            stats = {"count": 0, "mean": None, "std": None, "min": None,
+                     "max": None, "25%": None, "50%": None, "75%": None}
+        else:
+            mean, std = _mean_std(values)
+            q = np.percentile(values, [0, 25, 50, 75, 100])
+            stats = {
+                "count": count,
+                "mean": float(mean),
+                "std": float(std),
+                "min": float(q[0]),
+                "max": float(q[4]),
+                "25%": float(q[1]),
+                "50%": float(q[2]),
+                "75%": float(q[3]),
+            }
+
+        entry["stats"] = stats
+        return stats
+
     def generate_basic_stats(self, column: str = 'temperature') -> Dict:
         """
         生成基础统计数据
         """
         basic_stats = {}
-        
+
         # 原始数据统计
         if column in self.raw_df.columns:
-            raw_data = self.raw_df[column].dropna()
-            basic_stats["raw_data"] = {
-                "count": int(len(raw_data)),
-                "mean": float(raw_data.mean()) if len(raw_data) > 0 else None,
-                "std": float(raw_data.std()) if len(raw_data) > 0 else None,
-                "min": float(raw_data.min()) if len(raw_data) > 0 else None,
-                "max": float(raw_data.max()) if len(raw_data) > 0 else None,
-                "25%": float(raw_data.quantile(0.25)) if len(raw_data) > 0 else None,
-                "50%": float(raw_data.quantile(0.5)) if len(raw_data) > 0 else None,
-                "75%": float(raw_data.quantile(0.75)) if len(raw_data) > 0 else None,
-            }
-        
+            basic_stats["raw_data"] = dict(self._col_stats("raw", column))
+
         # 清洗后数据统计
         if column in self.cleaned_df.columns:
-            cleaned_data = self.cleaned_df[column].dropna()
-            basic_stats["cleaned_data"] = {
-                "count": int(len(cleaned_data)),
-                "mean": float(cleaned_data.mean()) if len(cleaned_data) > 0 else None,
-                "std": float(cleaned_data.std()) if len(cleaned_data) > 0 else None,
-                "min": float(cleaned_data.min()) if len(cleaned_data) > 0 else None,
-                "max": float(cleaned_data.max()) if len(cleaned_data) > 0 else None,
-                "25%": float(cleaned_data.quantile(0.25)) if len(cleaned_data) > 0 else None,
-                "50%": float(cleaned_data.quantile(0.5)) if len(cleaned_data) > 0 else None,
-                "75%": float(cleaned_data.quantile(0.75)) if len(cleaned_data) > 0 else None,
-            }
-        
+            basic_stats["cleaned_data"] = dict(self._col_stats("cleaned", column))
+
         self.report["basic_stats"] = basic_stats
         return basic_stats
     
@@ -108,8 +193,8 @@ class QualityReportGenerator:
         """
         生成缺失值分析
         """
-        raw_missing = self._get_missing_stats(self.raw_df, column)
-        cleaned_missing = self._get_missing_stats(self.cleaned_df, column)
+        raw_missing = self._get_missing_stats("raw", column)
+        cleaned_missing = self._get_missing_stats("cleaned", column)
         
         missing_analysis = {
             "raw_data": raw_missing,
@@ -117,14 +202,23 @@ class QualityReportGenerator:
             "summary": {
                 "missing_fixed": raw_missing["total_missing"] - cleaned_missing["total_missing"],
                 "missing_remaining": cleaned_missing["total_missing"],
-                "improvement_percentage": f"{(1 - cleaned_missing['missing_rate'] / raw_missing['missing_rate']) * 100:.2f}%" 
-                                         if raw_missing['missing_rate'] > 0 else "100.00%"
+                # 以浮点比率保存，只在打印/保存时格式化为百分比
+                "improvement_rate": float(1 - cleaned_missing['missing_rate'] / raw_missing['missing_rate'])
+                                    if raw_missing['missing_rate'] > 0 else 1.0
             }
         }
         
         self.report["missing_analysis"] = missing_analysis
         return missing_analysis
     
+    @staticmethod
+    def _format_missing_summary(summary: Dict) -> Dict[str, Any]:
+        """将缺失值处理摘要转换为展示用的键值（比率在此处才格式化为百分比）"""
+        display = dict(summary)
+        if "improvement_rate" in display:
+            display["improvement_percentage"] = f"{display.pop('improvement_rate'):.2%}"
+        return display
+    
     def generate_outlier_analysis(self, outlier_mask: Optional[pd.Series] = None) -> Dict:
         """
         生成异常值分析
@@ -134,7 +228,7 @@ class QualityReportGenerator:
         """
         if outlier_mask is not None:
             outlier_count = int(outlier_mask.sum())
-            outlier_rate = outlier_count / len(self.raw_df) if len(self.raw_df) > 0 else 0
+            outlier_rate = outlier_count / self._n_raw if self._n_raw > 0 else 0
             
             outlier_analysis = {
                 "detected_outliers": {
@@ -159,15 +253,16 @@ class QualityReportGenerator:
         
         for col in ['temperature']:  # 可以扩展到更多列
             if col in self.raw_df.columns:
-                data = self.raw_df[col].dropna()
-                if len(data) > 0:
-                    mean_val = data.mean()
-                    std_val = data.std()
+                col_stats = self._col_stats("raw", col)
+                if col_stats["count"] > 0:
+                    mean_val = col_stats["mean"]
+                    std_val = col_stats["std"]
                     upper_bound = mean_val + 3 * std_val
                     lower_bound = mean_val - 3 * std_val
                     
-                    outliers = ((self.raw_df[col] > upper_bound) | 
-                               (self.raw_df[col] < lower_bound)).sum()
+                    # 均值/标准差取自缓存，这里只需在缓存的非缺失值上做一次比较计数
+                    values = self._clean_values("raw", col)
+                    outliers = np.count_nonzero((values > upper_bound) | (values < lower_bound))
                     
                     outlier_analysis[col] = {
                         "mean": float(mean_val),
@@ -175,8 +270,8 @@ class QualityReportGenerator:
                         "upper_3sigma": float(upper_bound),
                         "lower_3sigma": float(lower_bound),
                         "outlier_count": int(outliers),
-                        "outlier_percentage": f"{(outliers / len(self.raw_df)) * 100:.2f}%" 
-                                             if len(self.raw_df) > 0 else "0.00%"
+                        "outlier_percentage": f"{(outliers / self._n_raw) * 100:.2f}%" 
+                                             if self._n_raw > 0 else "0.00%"
                     }
         
         return outlier_analysis
@@ -190,7 +285,7 @@ class QualityReportGenerator:
             "data_overview": {
                 "raw_data_shape": self.raw_df.shape,
                 "cleaned_data_shape": self.cleaned_df.shape,
-                "columns": list(self.raw_df.columns) if hasattr(self.raw_df, 'columns') else [],
+                "columns": list(self._raw_columns),
             },
             "quality_indicators": {}
         }
@@ -201,7 +296,7 @@ class QualityReportGenerator:
             summary["quality_indicators"]["completeness"] = {
                 "raw": 1 - missing_info["raw_data"]["missing_rate"],
                 "cleaned": 1 - missing_info["cleaned_data"]["missing_rate"],
-                "improvement": missing_info["summary"]["improvement_percentage"]
+                "improvement": missing_info["summary"]["improvement_rate"]
             }
         
         self.report["summary"] = summary
@@ -214,7 +309,8 @@ class QualityReportGenerator:
         生成完整报告
         
         Returns:
-            包含所有分析的报告字典
+            包含所有分析的报告字典；其中 data_samples 的各项是 to_json(orient='records')
+            生成的JSON字符串（不再是记录列表），时间为秒精度的ISO格式
         """
         print("\n" + "="*60)
         print("生成数据质量报告")
@@ -233,10 +329,12 @@ class QualityReportGenerator:
         self.generate_data_quality_summary()
         print("✓ 质量摘要完成")
         
-        # 添加数据示例
+        # 添加数据示例（以JSON字符串保存，走pandas的C序列化路径，避免逐单元格装箱；
+        # double_precision=15 保留浮点精度，date_unit='s' 保持秒精度的时间戳）
+        json_options = dict(orient='records', date_format='iso', date_unit='s', double_precision=15)
         self.report["data_samples"] = {
-            "raw_first_5": self.raw_df.head().to_dict(orient='records'),
-            "cleaned_first_5": self.cleaned_df.head().to_dict(orient='records')
+            "raw_first_5": self.raw_df.head().to_json(**json_options),
+            "cleaned_first_5": self.cleaned_df.head().to_json(**json_options)
         }
         
         print("\n✅ 报告生成完成!")
@@ -267,7 +365,7 @@ class QualityReportGenerator:
             print(f"\n⚠️  缺失值情况:")
             print(f"  原始数据缺失率: {missing['raw_data']['missing_percentage']}")
             print(f"  清洗后缺失率: {missing['cleaned_data']['missing_percentage']}")
-            print(f"  修复率: {missing['summary']['improvement_percentage']}")
+            print(f"  修复率: {missing['summary']['improvement_rate']:.2%}")
         
         # 异常值情况
         if "outlier_analysis" in self.report:
@@ -308,73 +406,76 @@ class QualityReportGenerator:
     
     def _save_as_txt(self, path: str):
         """保存为文本文件"""
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write("="*60 + "\n")
-            f.write("气象数据质量报告\n")
-            f.write("="*60 + "\n\n")
+        buf = io.StringIO()
+        w = buf.write
+        w("="*60 + "\n")
+        w("气象数据质量报告\n")
+        w("="*60 + "\n\n")
+        
+        # 数据概况
+        if "summary" in self.report:
+            summary = self.report["summary"]
+            w("1. 数据概况\n")
+            w("-"*40 + "\n")
+            w(f"生成时间: {summary['report_generated_at']}\n")
+            w(f"原始数据形状: {summary['data_overview']['raw_data_shape']}\n")
+            w(f"清洗后数据形状: {summary['data_overview']['cleaned_data_shape']}\n")
+            w(f"数据列: {', '.join(summary['data_overview']['columns'])}\n\n")
+        
+        # 基础统计
+        if "basic_stats" in self.report:
+            w("2. 基础统计分析\n")
+            w("-"*40 + "\n")
             
-            # 数据概况
-            if "summary" in self.report:
-                summary = self.report["summary"]
-                f.write("1. 数据概况\n")
-                f.write("-"*40 + "\n")
-                f.write(f"生成时间: {summary['report_generated_at']}\n")
-                f.write(f"原始数据形状: {summary['data_overview']['raw_data_shape']}\n")
-                f.write(f"清洗后数据形状: {summary['data_overview']['cleaned_data_shape']}\n")
-                f.write(f"数据列: {', '.join(summary['data_overview']['columns'])}\n\n")
+            for data_type, stats in self.report["basic_stats"].items():
+                w(f"\n{data_type}:\n")
+                for key, value in stats.items():
+                    if value is not None:
+                        w(f"  {key}: {value}\n")
+            w("\n")
+        
+        # 缺失值分析
+        if "missing_analysis" in self.report:
+            w("3. 缺失值分析\n")
+            w("-"*40 + "\n")
             
-            # 基础统计
-            if "basic_stats" in self.report:
-                f.write("2. 基础统计分析\n")
-                f.write("-"*40 + "\n")
-                
-                for data_type, stats in self.report["basic_stats"].items():
-                    f.write(f"\n{data_type}:\n")
-                    for key, value in stats.items():
-                        if value is not None:
-                            f.write(f"  {key}: {value}\n")
-                f.write("\n")
+            missing = self.report["missing_analysis"]
+            w(f"\n原始数据:\n")
+            for key, value in missing["raw_data"].items():
+                if key != "gap_lengths":
+                    w(f"  {key}: {value}\n")
             
-            # 缺失值分析
-            if "missing_analysis" in self.report:
-                f.write("3. 缺失值分析\n")
-                f.write("-"*40 + "\n")
-                
-                missing = self.report["missing_analysis"]
-                f.write(f"\n原始数据:\n")
-                for key, value in missing["raw_data"].items():
-                    if key != "gap_lengths":
-                        f.write(f"  {key}: {value}\n")
-                
-                f.write(f"\n清洗后数据:\n")
-                for key, value in missing["cleaned_data"].items():
-                    if key != "gap_lengths":
-                        f.write(f"  {key}: {value}\n")
-                
-                f.write(f"\n处理摘要:\n")
-                for key, value in missing["summary"].items():
-                    f.write(f"  {key}: {value}\n")
-                f.write("\n")
+            w(f"\n清洗后数据:\n")
+            for key, value in missing["cleaned_data"].items():
+                if key != "gap_lengths":
+                    w(f"  {key}: {value}\n")
             
-            # 异常值分析
-            if "outlier_analysis" in self.report:
-                f.write("4. 异常值分析\n")
-                f.write("-"*40 + "\n")
-                
-                outlier = self.report["outlier_analysis"]
-                if "detected_outliers" in outlier:
-                    for key, value in outlier["detected_outliers"].items():
-                        f.write(f"  {key}: {value}\n")
-                f.write(f"检测方法: {outlier.get('method', 'N/A')}\n\n")
+            w(f"\n处理摘要:\n")
+            for key, value in self._format_missing_summary(missing["summary"]).items():
+                w(f"  {key}: {value}\n")
+            w("\n")
+        
+        # 异常值分析
+        if "outlier_analysis" in self.report:
+            w("4. 异常值分析\n")
+            w("-"*40 + "\n")
             
-            f.write("="*60 + "\n")
-            f.write("报告结束\n")
-            f.write("="*60 + "\n")
+            outlier = self.report["outlier_analysis"]
+            if "detected_outliers" in outlier:
+                for key, value in outlier["detected_outliers"].items():
+                    w(f"  {key}: {value}\n")
+            w(f"检测方法: {outlier.get('method', 'N/A')}\n\n")
+        
+        w("="*60 + "\n")
+        w("报告结束\n")
+        w("="*60 + "\n")
+        
+        # 先在内存中拼接，再一次性写入文件
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(buf.getvalue())
     
     def _save_as_json(self, path: str):
-        """保存为JSON文件"""
-        import json
-        
+        """保存为JSON文件(优先使用orjson在C层直接序列化numpy类型)"""
         # 转换不能序列化的对象
         def default_serializer(obj):
             if isinstance(obj, (np.integer, np.floating)):
@@ -385,80 +486,104 @@ class QualityReportGenerator:
                 return obj.isoformat()
             return str(obj)
         
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.report, f, indent=2, default=default_serializer, ensure_ascii=False)
+        try:
+            import orjson
+            loads = orjson.loads
+        except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+            import json
+            orjson = None
+            loads = json.loads
+        
+        # 数据示例以JSON字符串保存，写文件时解析回嵌套结构
+        report = dict(self.report)
+        if "data_samples" in report:
+            report["data_samples"] = {key: loads(value) for key, value in report["data_samples"].items()}
+        
+        if orjson is None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, default=default_serializer, ensure_ascii=False)
+            return
+        
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(report, default=default_serializer, option=options))
     
     def _save_as_markdown(self, path: str):
         """保存为Markdown文件"""
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write("# 气象数据质量报告\n\n")
+        buf = io.StringIO()
+        w = buf.write
+        w("# 气象数据质量报告\n\n")
+        
+        # 数据概况
+        if "summary" in self.report:
+            summary = self.report["summary"]
+            w(f"**生成时间**: {summary['report_generated_at']}\n\n")
+            
+            w("## 1. 数据概况\n\n")
+            w(f"- **原始数据**: {summary['data_overview']['raw_data_shape'][0]} 行 × {summary['data_overview']['raw_data_shape'][1]} 列\n")
+            w(f"- **清洗后数据**: {summary['data_overview']['cleaned_data_shape'][0]} 行 × {summary['data_overview']['cleaned_data_shape'][1]} 列\n")
+            w(f"- **数据列**: {', '.join(summary['data_overview']['columns'])}\n\n")
+        
+        # 基础统计
+        if "basic_stats" in self.report:
+            w("## 2. 基础统计分析\n\n")
             
-            # 数据概况
-            if "summary" in self.report:
-                summary = self.report["summary"]
-                f.write(f"**生成时间**: {summary['report_generated_at']}\n\n")
-                
-                f.write("## 1. 数据概况\n\n")
-                f.write(f"- **原始数据**: {summary['data_overview']['raw_data_shape'][0]} 行 × {summary['data_overview']['raw_data_shape'][1]} 列\n")
-                f.write(f"- **清洗后数据**: {summary['data_overview']['cleaned_data_shape'][0]} 行 × {summary['data_overview']['cleaned_data_shape'][1]} 列\n")
-                f.write(f"- **数据列**: {', '.join(summary['data_overview']['columns'])}\n\n")
+            for data_type, stats in self.report["basic_stats"].items():
+                w(f"### {data_type.replace('_', ' ').title()}\n\n")
+                w("| 指标 | 值 |\n")
+                w("|------|----|\n")
+                for key, value in stats.items():
+                    if value is not None:
+                        w(f"| {key} | {value} |\n")
+                w("\n")
+        
+        # 缺失值分析
+        if "missing_analysis" in self.report:
+            w("## 3. 缺失值分析\n\n")
             
-            # 基础统计
-            if "basic_stats" in self.report:
-                f.write("## 2. 基础统计分析\n\n")
-                
-                for data_type, stats in self.report["basic_stats"].items():
-                    f.write(f"### {data_type.replace('_', ' ').title()}\n\n")
-                    f.write("| 指标 | 值 |\n")
-                    f.write("|------|----|\n")
-                    for key, value in stats.items():
-                        if value is not None:
-                            f.write(f"| {key} | {value} |\n")
-                    f.write("\n")
+            missing = self.report["missing_analysis"]
+            w("### 原始数据\n\n")
+            w("| 指标 | 值 |\n")
+            w("|------|----|\n")
+            for key, value in missing["raw_data"].items():
+                if key != "gap_lengths":
+                    w(f"| {key} | {value} |\n")
             
-            # 缺失值分析
-            if "missing_analysis" in self.report:
-                f.write("## 3. 缺失值分析\n\n")
-                
-                missing = self.report["missing_analysis"]
-                f.write("### 原始数据\n\n")
-                f.write("| 指标 | 值 |\n")
-                f.write("|------|----|\n")
-                for key, value in missing["raw_data"].items():
-                    if key != "gap_lengths":
-                        f.write(f"| {key} | {value} |\n")
-                
-                f.write("\n### 清洗后数据\n\n")
-                f.write("| 指标 | 值 |\n")
-                f.write("|------|----|\n")
-                for key, value in missing["cleaned_data"].items():
-                    if key != "gap_lengths":
-                        f.write(f"| {key} | {value} |\n")
-                
-                f.write("\n### 处理摘要\n\n")
-                f.write("| 指标 | 值 |\n")
-                f.write("|------|----|\n")
-                for key, value in missing["summary"].items():
-                    f.write(f"| {key} | {value} |\n")
-                f.write("\n")
+            w("\n### 清洗后数据\n\n")
+            w("| 指标 | 值 |\n")
+            w("|------|----|\n")
+            for key, value in missing["cleaned_data"].items():
+                if key != "gap_lengths":
+                    w(f"| {key} | {value} |\n")
             
-            # 异常值分析
-            if "outlier_analysis" in self.report:
-                f.write("## 4. 异常值分析\n\n")
-                
-                outlier = self.report["outlier_analysis"]
-                f.write(f"**检测方法**: {outlier.get('method', 'N/A')}\n\n")
-                
-                if "detected_outliers" in outlier:
-                    f.write("| 指标 | 值 |\n")
-                    f.write("|------|----|\n")
-                    for key, value in outlier["detected_outliers"].items():
-                        f.write(f"| {key} | {value} |\n")
-                    f.write("\n")
+            w("\n### 处理摘要\n\n")
+            w("| 指标 | 值 |\n")
+            w("|------|----|\n")
+            for key, value in self._format_missing_summary(missing["summary"]).items():
+                w(f"| {key} | {value} |\n")
+            w("\n")
+        
+        # 异常值分析
+        if "outlier_analysis" in self.report:
+            w("## 4. 异常值分析\n\n")
             
-            f.write("---\n")
-            f.write("*报告结束*\n")
-
+            outlier = self.report["outlier_analysis"]
+            w(f"**检测方法**: {outlier.get('method', 'N/A')}\n\n")
+            
+            if "detected_outliers" in outlier:
+                w("| 指标 | 值 |\n")
+                w("|------|----|\n")
+                for key, value in outlier["detected_outliers"].items():
+                    w(f"| {key} | {value} |\n")
+                w("\n")
+        
+        w("---\n")
+        w("*报告结束*\n")
+        
+        # 先在内存中拼接，再一次性写入文件
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(buf.getvalue())
+    
 
 # 便捷函数
 def generate_quality_report(raw_df: pd.DataFrame, 
@@ -486,18 +611,20 @@ def generate_quality_report(raw_df: pd.DataFrame,
 
 
 if __name__ == "__main__":
-    # 1. 读取你的真实数据
+    from loader数据读取模块 import load_weather_data
+
+    # 1. 读取你的真实数据（PyArrow多线程解析，数值列直接按float32读入，无需类型推断）
     data_path = "../../demo_data.csv"  # 从 src/date 退两层
     print(f"正在读取数据: {data_path}")
-    df = pd.read_csv(data_path)
+    df = load_weather_data(data_path)
     print(f"数据形状: {df.shape}")
     
-   # 2. 简单清洗（示例）
-df_cleaned = df.copy()
-if 'temperature' in df_cleaned.columns:
-    # 用均值填充温度缺失值
-    mean_temp = df_cleaned['temperature'].mean()
-    df_cleaned['temperature'] = df_cleaned['temperature'].fillna(mean_temp)
+    # 2. 简单清洗（示例）
+    df_cleaned = df.copy()
+    if 'temperature' in df_cleaned.columns:
+        # 用均值填充温度缺失值
+        mean_temp = df_cleaned['temperature'].mean()
+        df_cleaned['temperature'] = df_cleaned['temperature'].fillna(mean_temp)
     
     # 3. 创建报告生成器
     generator = QualityReportGenerator(raw_df=df, cleaned_df=df_cleaned)
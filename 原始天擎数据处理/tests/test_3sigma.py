@@ -1,37 +1,12 @@
-import numpy as np
+import os
+import sys
+
 import pandas as pd
 
-# 直接把quality_check.py里的类定义复制到这里
-class ThreeSigmaDetector:
-    def __init__(self, sigma_level: int = 3):
-        self.sigma_level = sigma_level
-        self.thresholds = {}
-    
-    def fit(self, data_series: pd.Series) -> None:
-        mean = data_series.mean()
-        std = data_series.std()
-        self.thresholds = {
-            'mean': mean, 'std': std,
-            'upper_bound': mean + self.sigma_level * std,
-            'lower_bound': mean - self.sigma_level * std
-        }
-    
-    def detect(self, data_series: pd.Series) -> pd.Series:
-        if not self.thresholds:
-            self.fit(data_series)
-        anomalies = (data_series < self.thresholds['lower_bound']) | \
-                   (data_series > self.thresholds['upper_bound'])
-        return anomalies
-    
-    def generate_report(self, data_series: pd.Series):
-        anomalies = self.detect(data_series)
-        return {
-            'total_samples': len(data_series),
-            'anomaly_count': anomalies.sum(),
-            'anomaly_rate': anomalies.mean(),
-            'thresholds': self.thresholds,
-            'anomaly_indices': data_series[anomalies].index.tolist()
-        }
+# 把 src/date 加入搜索路径，按普通模块导入（可复用__pycache__中的字节码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'date'))
+
+from quality_check异常值检测函数 import ThreeSigmaDetector
 
 # 测试代码
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 把 src/date 加入搜索路径，按普通模块导入（可复用__pycache__中的字节码）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'date'))
+
+from quality_check异常值检测函数 import _znorm_3sigma_kernel, _znorm_3sigma_numpy
+from imputation缺失值处理模块 import linear_impute, linear_impute_many, parallel_impute
+from normalization数据标准化流程 import minmax_normalize, zscore_normalize
+
+
+def make_gappy_frame(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    """构造含开头/结尾缺失、短缺失和超过max_gap的长缺失段落的测试数据"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'temperature': rng.normal(20, 5, n),
+        'humidity': rng.uniform(30, 90, n),
+        'pressure': rng.normal(1010, 8, n).astype(np.float32),
+        'constant': np.full(n, 3.0),
+    })
+    df.loc[:2, 'temperature'] = np.nan            # 开头缺失
+    df.loc[n - 4:, 'temperature'] = np.nan        # 结尾缺失
+    df.loc[40:41, 'temperature'] = np.nan         # 短缺失，应被插值
+    df.loc[60:79, 'temperature'] = np.nan         # 长缺失，应保持NaN
+    df.loc[10:16, 'humidity'] = np.nan            # 刚超过max_gap=5
+    df.loc[100:104, 'humidity'] = np.nan          # 恰好等于max_gap=5
+    df.loc[[5, 50, 150], 'pressure'] = np.nan
+    df.loc[n - 1, 'constant'] = np.nan
+    return df
+
+
+def _quiet(func, *args, **kwargs):
+    """调用插值函数时屏蔽逐列打印"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _reference_impute(df: pd.DataFrame, columns, max_gap: int) -> pd.DataFrame:
+    """逐列调用 linear_impute 得到的参考结果"""
+    result = df
+    for column in columns:
+        result = _quiet(linear_impute, result, column=column, max_gap=max_gap)
+    return result
+
+
+def test_multi_column_impute_matches_linear_impute():
+    """linear_impute_many / parallel_impute 与逐列 linear_impute 结果一致"""
+    df = make_gappy_frame()
+    columns = ['temperature', 'humidity', 'pressure', 'constant']
+    expected = _reference_impute(df, columns, max_gap=5)
+
+    candidates = {
+        'linear_impute_many': _quiet(linear_impute_many, df, max_gap=5),
+        'parallel_impute(单进程)': _quiet(parallel_impute, df, max_gap=5, max_workers=1),
+        'parallel_impute(多进程)': _quiet(parallel_impute, df, max_gap=5, max_workers=2),
+    }
+    for name, result in candidates.items():
+        for column in columns:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=np.float64),
+                                       expected[column].to_numpy(dtype=np.float64),
+                                       rtol=1e-6, equal_nan=True, err_msg=f"{name}: 列 '{column}'")
+        print(f"{name} 与逐列 linear_impute 一致，剩余缺失值: {int(result[columns].isna().sum().sum())}")
+
+    # 长缺失段落保持NaN，开头缺失无法线性插值
+    assert expected.loc[60:79, 'temperature'].isna().all()
+    assert expected.loc[10:16, 'humidity'].isna().all()
+    assert expected.loc[100:104, 'humidity'].notna().all()
+    assert df['temperature'].isna().sum() == 29  # 原数据未被修改
+
+
+def test_znorm_kernel_matches_numpy():
+    """融合内核与NumPy回退实现的z分数、均值、标准差和异常计数一致"""
+    if _znorm_3sigma_kernel is None:
+        print("未安装numba，跳过内核对比")
+        return
+    df = make_gappy_frame()
+    df.loc[7, 'humidity'] = 500.0  # 制造异常值
+    block = np.asfortranarray(df.to_numpy(dtype=np.float64, na_value=np.nan))
+    kernel = _znorm_3sigma_kernel(block, 3.0)
+    numpy = _znorm_3sigma_numpy(block, 3.0)
+    for got, expected in zip(kernel, numpy):
+        np.testing.assert_allclose(got, expected, rtol=1e-10, atol=1e-12, equal_nan=True)
+    print(f"融合内核与NumPy实现一致，异常计数: {kernel[3].tolist()}")
+
+
+def test_polars_backend_matches_numpy():
+    """安装polars时，polars后端的标准化结果与numpy后端一致"""
+    try:
+        import polars  # noqa: F401
+    except ImportError:
+        print("未安装polars，跳过后端对比")
+        return
+    df = make_gappy_frame()
+    for func in (zscore_normalize, minmax_normalize):
+        by_numpy = func(df, backend='numpy')
+        by_polars = func(df, backend='polars')
+        for column in df.columns:
+            # polars按列的原类型(float32)计算统计量，numpy后端以float64累加，float32列放宽容差
+            tol = 1e-5 if df[column].dtype == np.float32 else 1e-10
+            np.testing.assert_allclose(by_polars[column].to_numpy(dtype=np.float64),
+                                       by_numpy[column].to_numpy(dtype=np.float64),
+                                       rtol=tol, atol=tol, equal_nan=True,
+                                       err_msg=f"{func.__name__}: 列 '{column}'")
+        print(f"{func.__name__}: polars后端与numpy后端一致")
+
+
+# 测试代码
+if __name__ == "__main__":
+    # 先运行多进程插值：numba并行内核启动线程池(如TBB)后再fork子进程，解释器退出时可能挂起
+    test_multi_column_impute_matches_linear_impute()
+    test_znorm_kernel_matches_numpy()
+    test_polars_backend_matches_numpy()
+    print("全部对比通过")